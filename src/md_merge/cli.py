@@ -1,13 +1,14 @@
 """Command Line Interface definition using argparse."""
 
 import argparse
+import itertools
 import logging
+import os
 import sys
 from enum import Enum
 from pathlib import Path
-from uuid import uuid4
+from typing import TYPE_CHECKING
 
-from md_merge import file_handler, merger
 from md_merge import logger as md_logger
 from md_merge.exceptions import (
     DirectoryNotFoundError,
@@ -19,6 +20,9 @@ from md_merge.exceptions import (
     ValidationError,
 )
 
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
 # Get a logger instance for this module
 logger = logging.getLogger(__name__)
 
@@ -34,7 +38,7 @@ def set_logging_level(value: bool) -> None:
 
 def generate_dft_output_path() -> Path:
     """Generate a default output path for the merged file."""
-    return Path.cwd() / f"md-merge-{uuid4()}.md"
+    return Path.cwd() / f"md-merge-{os.urandom(8).hex()}.md"
 
 
 def setup_command_line_parser() -> argparse.ArgumentParser:
@@ -70,8 +74,15 @@ def setup_command_line_parser() -> argparse.ArgumentParser:
         "--output",
         "-o",
         type=Path,
-        default=generate_dft_output_path(),
-        help="Path for the merged output Markdown file.",
+        default=None,
+        help="Path for the merged output Markdown file (default: ./md-merge-<id>.md).",
+    )
+
+    # Cache option
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Skip the merge if the inputs are unchanged since the last --cache run.",
     )
 
     # Verbose option
@@ -95,16 +106,43 @@ class ErrorCode(Enum):
 
 error_messages = {
     ErrorCode.SUCCESS: "Success",
-    ErrorCode.VALIDATION_ERROR: "Validation error occurred. {error}",
-    ErrorCode.FILE_DIRECTORY_ERROR: "File/directory error occurred. {error}",
-    ErrorCode.FILE_PROCESSING_ERROR: "Error processing file. {error}",
-    ErrorCode.APPLICATION_ERROR: "Application error occurred. {error}",
-    ErrorCode.UNEXPECTED_ERROR: "An unexpected error occurred. {error}",
+    ErrorCode.VALIDATION_ERROR: "Validation error occurred. %s",
+    ErrorCode.FILE_DIRECTORY_ERROR: "File/directory error occurred. %s",
+    ErrorCode.FILE_PROCESSING_ERROR: "Error processing file. %s",
+    ErrorCode.APPLICATION_ERROR: "Application error occurred. %s",
+    ErrorCode.UNEXPECTED_ERROR: "An unexpected error occurred. %s",
 }
 
 
+# Error code reported for each handled exception type, grouped by code. Lookups walk the
+# exception's MRO, so the most specific registered class wins; anything else is an unexpected
+# error.
+error_codes: dict[type[Exception], ErrorCode] = {
+    error_type: error_code
+    for error_code, error_types in (
+        (
+            ErrorCode.FILE_DIRECTORY_ERROR,
+            (FileNotFoundError, NotAFileError, DirectoryNotFoundError, NotADirectoryError),
+        ),
+        (ErrorCode.VALIDATION_ERROR, (ValidationError, ValueError)),
+        (ErrorCode.FILE_PROCESSING_ERROR, (FileProcessingError,)),
+        (ErrorCode.APPLICATION_ERROR, (MdMergeError,)),
+    )
+    for error_type in error_types
+}
+
+
+def get_error_code(error: Exception) -> ErrorCode:
+    """Return the error code registered for the most specific class of the error."""
+    for error_type in type(error).__mro__:
+        error_code = error_codes.get(error_type)
+        if error_code is not None:
+            return error_code
+    return ErrorCode.UNEXPECTED_ERROR
+
+
 def exit_on_cli_error(error_code: ErrorCode, error: Exception) -> None:
-    logger.error(error_messages[error_code].format(error=error), exc_info=False)
+    logger.error(error_messages[error_code], error, exc_info=False)
     sys.exit(error_code.value)
 
 
@@ -113,11 +151,17 @@ def main() -> None:
     # Set up the argument parser
     parser = setup_command_line_parser()
     args = parser.parse_args()
+    args.output = args.output or generate_dft_output_path()
+
+    # Deferred so that --help and argument errors exit without loading the merge machinery.
+    # Imported before logging is configured because merger sets up logging at import time.
+    from md_merge import file_handler, merger  # noqa: PLC0415
 
     # Set up logging based on verbosity
     set_logging_level(args.verbose)
 
-    input_paths: list[Path] = []
+    input_paths: Iterator[Path] = iter(())
+    merged_files = 0
 
     try:
         # Validate inputs
@@ -128,33 +172,30 @@ def main() -> None:
         if operation_mode == file_handler.MergeType.FILES:
             logger.info("Mode: Explicit files")
             file_handler.validate_input_files(args.files)
-            input_paths = args.files
+            input_paths = iter(args.files)
         elif operation_mode == file_handler.MergeType.DIRECTORY:
             logger.info("Mode: Directory")
-            file_handler.validate_input_directory(args.directory)
+            # find_markdown_files validates the directory while scanning it
             input_paths = file_handler.find_markdown_files(args.directory)
 
-        # Check if any files were found
-        if not input_paths:
-            logger.warning(f"No '.md' files found in directory {args.directory}. Nothing to merge.")
+        # Check if any files were found, without waiting for the whole directory walk
+        first_path = next(input_paths, None)
+        if first_path is None:
+            logger.warning(
+                "No '.md' files found in directory %s. Nothing to merge.", args.directory
+            )
             return
 
-        # Merge files
-        merger.merge_files(input_paths, args.output)
+        # Merge files while the remaining paths are still being found
+        merged_files = merger.merge_files(
+            itertools.chain([first_path], input_paths), args.output, use_cache=args.cache
+        )
 
-    except (ValidationError, ValueError) as e:
-        exit_on_cli_error(ErrorCode.VALIDATION_ERROR, e)
-    except (FileNotFoundError, NotAFileError, DirectoryNotFoundError, NotADirectoryError) as e:
-        exit_on_cli_error(ErrorCode.FILE_DIRECTORY_ERROR, e)
-    except FileProcessingError as e:
-        exit_on_cli_error(ErrorCode.FILE_PROCESSING_ERROR, e)
-    except MdMergeError as e:  # Catch base custom error
-        exit_on_cli_error(ErrorCode.APPLICATION_ERROR, e)
-    except Exception as e:  # Catch-all for unexpected errors
-        exit_on_cli_error(ErrorCode.UNEXPECTED_ERROR, e)
+    except Exception as e:
+        exit_on_cli_error(get_error_code(e), e)
 
     logger.info("md-merge process completed successfully.")
-    logger.info(f"Successfully merged {len(input_paths)} file(s) into {args.output}")
+    logger.info("Successfully merged %d file(s) into %s", merged_files, args.output)
 
 
 if __name__ == "__main__":
@@ -1,6 +1,10 @@
 """Handles file and directory path operations."""
 
+import errno
 import logging
+import os
+import stat
+from collections.abc import Iterator
 from enum import Enum
 from pathlib import Path
 
@@ -15,6 +19,9 @@ from md_merge.exceptions import (
 
 logger = logging.getLogger(__name__)
 
+# errno values for which a path is reported as missing (the same set Path.exists() ignores)
+_MISSING_PATH_ERRNOS = frozenset({errno.ENOENT, errno.ENOTDIR, errno.EBADF, errno.ELOOP})
+
 
 class MergeType(Enum):
     """Enum for merge options."""
@@ -26,28 +33,67 @@ class MergeType(Enum):
         return self.value
 
 
-def find_markdown_files(directory: Path) -> list[Path]:
-    logger.debug(f"Searching for markdown files in directory: {directory}")
-    if not directory.exists():
-        raise DirectoryNotFoundError(f"Directory not found: {directory}")
-    if not directory.is_dir():
-        raise NotADirectoryError(f"Path is not a directory: {directory}")
+def find_markdown_files(directory: Path) -> Iterator[Path]:
+    """Yield the '.md' files below a directory in alphabetical (path) order.
 
+    Files are produced while the tree is still being walked, so callers can start
+    working on the first file before the whole directory has been listed.
+    """
+    logger.debug(f"Searching for markdown files in directory: {directory}")
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+    found = 0
     try:
-        # Use rglob to find all markdown files in the directory
-        md_files = sorted(directory.rglob("*.md"))
-        logger.info(f"Found {len(md_files)} markdown files in {directory}.")
-
-        # Debug logging for found files
-        if logger.isEnabledFor(logging.DEBUG):
-            logger.debug(f"Found markdown files: {'\n'.join([f'- {file!s}' for file in md_files])}")
-
-        return md_files
-
+        for md_file in _walk_markdown_files(directory):
+            found += 1
+            if debug_enabled:
+                logger.debug(f"  - Found: {md_file}")
+            yield md_file
+
+    except FileProcessingError:
+        raise
     except Exception as e:
         logger.error(f"Error finding markdown files in {directory}: {e}", exc_info=True)
         raise FileProcessingError(f"Failed to find markdown files in {directory}: {e}") from e
 
+    logger.info(f"Found {found} markdown files in {directory}.")
+
+
+def _walk_markdown_files(directory: Path) -> Iterator[Path]:
+    """Walk a directory depth-first, yielding '.md' files.
+
+    Each directory's entries are sorted as it is listed, which keeps the overall output in
+    path order without collecting the whole tree first.
+    """
+    pending = [iter(_list_directory(os.fspath(directory), root=directory))]
+    while pending:
+        entry = next(pending[-1], None)
+        if entry is None:
+            pending.pop()
+        elif entry.is_dir(follow_symlinks=False):
+            pending.append(iter(_list_directory(entry.path)))
+        elif entry.name.endswith(".md") and entry.is_file():
+            yield Path(entry.path)
+
+
+def _list_directory(path: str, root: Path | None = None) -> list[os.DirEntry[str]]:
+    """Return a directory's entries sorted by name.
+
+    ``root`` marks the directory the walk started from. It is not stat()ed up front;
+    scandir itself reports a missing or non-directory root.
+    """
+    try:
+        with os.scandir(path) as entries:
+            return sorted(entries, key=lambda entry: os.path.normcase(entry.name))
+    except OSError as e:
+        if root is None and e.errno == errno.EACCES:
+            logger.warning(f"Skipping directory {path}: Permission denied.")
+            return []
+        if root is not None and e.errno == errno.ENOENT:
+            raise DirectoryNotFoundError(f"Directory not found: {root}") from e
+        if root is not None and e.errno == errno.ENOTDIR:
+            raise NotADirectoryError(f"Path is not a directory: {root}") from e
+        raise
+
 
 def validate_inputs(files: list[Path], directory: Path) -> None:
     logger.debug("Validating input files and directory.")
@@ -61,36 +107,36 @@ def validate_inputs(files: list[Path], directory: Path) -> None:
 
 def select_merge_type(files: list[Path], directory: Path) -> MergeType:
     """Determine the merge type based on user input."""
-    if files:
-        logger.debug("Merge type selected: FILES")
-        return MergeType.FILES
-    if directory:
-        logger.debug("Merge type selected: DIRECTORY")
-        return MergeType.DIRECTORY
-    raise ValueError("No valid merge type found. Please specify files or a directory.")
+    merge_type = MergeType.FILES if files else MergeType.DIRECTORY if directory else None
+    if merge_type is None:
+        raise ValueError("No valid merge type found. Please specify files or a directory.")
+    logger.debug("Merge type selected: %s", merge_type.name)
+    return merge_type
 
 
-def validate_input_directory(directory: Path) -> None:
-    logger.debug(f"Validating directory path: {directory}")
-    if not directory.exists():
-        raise DirectoryNotFoundError(f"Directory not found: {directory}")
-    if not directory.is_dir():
-        raise NotADirectoryError(f"Path is not a directory: {directory}")
-    logger.debug("Directory path is valid.")
+def _stat_mode(path: Path) -> int | None:
+    """Return the path's st_mode from a single stat() call, or None if it does not exist."""
+    try:
+        return path.stat().st_mode
+    except OSError as e:
+        if e.errno not in _MISSING_PATH_ERRNOS:
+            raise
+        return None
 
 
 def validate_input_files(files: list[Path]) -> None:
     logger.debug(f"Validating {len(files)} input file paths.")
     for file_path in files:
-        if not file_path.exists():
+        file_mode = _stat_mode(file_path)
+        if file_mode is None:
             raise FileNotFoundError(f"Input file not found: {file_path}")
 
         # Check if the path is a file
-        if not file_path.is_file():
+        if not stat.S_ISREG(file_mode):
             raise NotAFileError(f"Input path is not a file: {file_path}")
 
         # Check if the file has a .md extension
-        if file_path.suffix != ".md":
+        if not os.fspath(file_path).endswith(".md"):
             raise NotMarkdownFileError(f"Input file is not a markdown file: {file_path}")
         logger.debug(f"  - Validated: {file_path}")
     logger.debug("All input file paths are valid.")
@@ -1,10 +1,18 @@
 """Core logic for merging Markdown files."""
 
-import datetime
+import hashlib
 import logging
+import os
+import stat
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from string import Template
+from string import Formatter, Template
+from typing import BinaryIO
 
+from md_merge import __version__
 from md_merge import logger as md_logger
 from md_merge.exceptions import FileProcessingError
 
@@ -20,6 +28,11 @@ SEPARATOR_TEMPLATE = Template(
 \n
 """
 )
+# SEPARATOR_TEMPLATE split around its placeholder and encoded, so building a separator only
+# encodes the file name instead of running Template's substitution over the whole text.
+_SEPARATOR_PREFIX, _SEPARATOR_SUFFIX = (
+    part.encode("utf-8") for part in SEPARATOR_TEMPLATE.template.split("${source_path}")
+)
 HEADER_TEMPLATE = """# {final_document_title}
 
 <details>
@@ -32,67 +45,301 @@ HEADER_TEMPLATE = """# {final_document_title}
 </details>
 
 """
+# HEADER_TEMPLATE as encoded literal text interleaved with the names of its fields
+_HEADER_PARTS: list[bytes | str] = [
+    part
+    for literal, field_name, _, _ in Formatter().parse(HEADER_TEMPLATE)
+    for part in (literal.encode("utf-8"), field_name)
+    if part
+]
+
+# Concurrent reads: a few per CPU, since they mostly wait on I/O. The cap also bounds
+# the number of input files open at once.
+_MAX_READ_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+_READ_FLAGS = os.O_RDONLY | getattr(os, "O_BINARY", 0) | getattr(os, "O_CLOEXEC", 0)
+_READ_CHUNK_SIZE = 1 << 16
+# Reads may run ahead of the writer by this many files; this bounds memory to a window
+# of file contents rather than the whole document.
+_READ_AHEAD = 2 * _MAX_READ_WORKERS
+# The output is written in many small pieces, which this buffer coalesces into large writes.
+_WRITE_BUFFER_SIZE = 1 << 20
+
+
+def _read_utf8(path: Path, known_stat: os.stat_result | None = None) -> str:
+    """Read a UTF-8 text file with plain os calls: open, fstat, read and close.
+
+    This skips the buffered and text I/O layers ``Path.read_text`` builds around each file.
+    Newlines are translated the same way text mode would. A ``known_stat`` taken earlier
+    sizes the read instead of the fstat().
+    """
+    fd = os.open(path, _READ_FLAGS)
+    try:
+        size = (known_stat or os.fstat(fd)).st_size
+        # Ask for one extra byte so a file that grew since it was stat()ed is noticed, then
+        # read on until EOF: os.read() may return fewer bytes than asked for at any point.
+        chunks = [os.read(fd, size + 1)]
+        remaining = size + 1 - len(chunks[0])
+        while chunk := os.read(fd, max(remaining, _READ_CHUNK_SIZE)):
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        data = chunks[0] if len(chunks) == 1 else b"".join(chunks)
+    finally:
+        os.close(fd)
+
+    text = data.decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
 
 
 def merge_files(
-    input_paths: list[Path], output_path: Path, final_document_title: str = "Merged Markdown File"
-) -> None:
-    total_files = len(input_paths)
-    logger.info(
-        f"Starting merge process. Creating '{final_document_title.title()}' \
-            from {total_files} files."
-    )
+    input_paths: Iterable[Path],
+    output_path: Path,
+    final_document_title: str = "Merged Markdown File",
+    use_cache: bool = False,
+) -> int:
+    """Merge the files into a single document and return the number of input files.
+
+    ``input_paths`` may be a lazy iterable such as ``find_markdown_files``: the first reads
+    start as soon as their paths arrive, overlapping them with the directory walk. The
+    document is streamed to ``output_path`` instead of being assembled in memory.
+
+    With ``use_cache``, a fingerprint of the inputs is stored next to the output and the
+    merge is skipped entirely while neither the inputs nor the output have changed.
+    """
+    # Reads are I/O bound and release the GIL, so they are overlapped in a small pool.
+    # Results are still consumed in input order, one file at a time.
+    with ThreadPoolExecutor(max_workers=_MAX_READ_WORKERS) as executor:
+        reads = _ReadAhead(executor)
+        source_paths = reads.source_paths
+        for path in input_paths:
+            source_paths.append(path)
+            # With the cache enabled, nothing is read until it has been checked
+            if not use_cache:
+                reads.fill()
+
+        total_files = len(source_paths)
+        cache_key = None
+        if use_cache:
+            # Each input is stat()ed once; the results also size the reads below
+            reads.source_stats = _stat_sources(source_paths)
+            cache_key = _merge_cache_key(source_paths, reads.source_stats, final_document_title)
+        if cache_key is not None and _is_merge_cached(output_path, cache_key):
+            logger.info("Inputs unchanged since the last merge into %s; skipping.", output_path)
+            return total_files
+
+        logger.info(
+            "Starting merge process. Creating '%s' \
+            from %d files.",
+            final_document_title.title(),
+            total_files,
+        )
+
+        # Construct the document header
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime())
+        header = _render_header(
+            final_document_title=final_document_title,
+            timestamp=timestamp,
+            file_count=total_files,
+        )
+        write_merged_output(output_path, _iter_merged_chunks(header, reads))
 
-    merged_content_parts = []
+    if cache_key is not None:
+        _store_merge_cache(output_path, cache_key)
+    return total_files
 
-    for file_index, source_path in enumerate(input_paths):
-        logger.info(f"Processing file ({file_index + 1}/{total_files}): {source_path.name}")
+
+def _stat_sources(source_paths: list[Path]) -> list[os.stat_result | None]:
+    """stat() each input once; None marks an input that could not be stat()ed."""
+    source_stats: list[os.stat_result | None] = []
+    for path in source_paths:
         try:
-            file_content = source_path.read_text(encoding="utf-8")
-            logger.debug(f"Read {len(file_content)} characters from {source_path}")
-
-            # Add separator before files except the first one
-            if file_index > 0:
-                separator = SEPARATOR_TEMPLATE.safe_substitute(source_path=source_path.name)
-                merged_content_parts.append(separator)
-
-            merged_content_parts.append(file_content)
-
-        except FileNotFoundError:
-            logger.warning(f"Skipping file {source_path}: Not found.")
-        except OSError as e:
-            logger.error(f"Skipping file {source_path} due to read error: {e}", exc_info=False)
-        except Exception as e:
-            logger.error(f"Skipping file {source_path} due to unexpected error: {e}", exc_info=True)
-            raise FileProcessingError(f"Unexpected error reading file {source_path}: {e}") from e
-
-    # Construct the final document
-    timestamp = datetime.datetime.now(tz=datetime.UTC).strftime("%Y-%m-%d %H:%M:%S %Z")
-    header = HEADER_TEMPLATE.format(
-        final_document_title=final_document_title,
-        timestamp=timestamp,
-        file_count=total_files,
+            source_stats.append(path.stat())
+        except OSError:
+            source_stats.append(None)
+    return source_stats
+
+
+def _merge_cache_key(
+    source_paths: list[Path],
+    source_stats: list[os.stat_result | None],
+    final_document_title: str,
+) -> str:
+    """Fingerprint a merge from the tool version, title and each input's path, mtime and size."""
+    digest = hashlib.blake2b(f"{__version__}\0{final_document_title}\0".encode(), digest_size=16)
+    for path, file_stat in zip(source_paths, source_stats, strict=True):
+        if file_stat is None:
+            fingerprint = f"{path}\0missing\0"
+        else:
+            fingerprint = f"{path}\0{file_stat.st_mtime_ns}\0{file_stat.st_size}\0"
+        digest.update(fingerprint.encode("utf-8", "surrogateescape"))
+    return digest.hexdigest()
+
+
+def _merge_cache_path(output_path: Path) -> Path:
+    return output_path.with_name(f"{output_path.name}.cache")
+
+
+def _merge_cache_entry(output_path: Path, cache_key: str) -> str:
+    """Cache file contents: the input fingerprint plus the output's own size and mtime."""
+    output_stat = output_path.stat()
+    return f"{cache_key}\n{output_stat.st_size} {output_stat.st_mtime_ns}\n"
+
+
+def _is_merge_cached(output_path: Path, cache_key: str) -> bool:
+    try:
+        cached_entry = _merge_cache_path(output_path).read_text(encoding="utf-8")
+        return cached_entry == _merge_cache_entry(output_path, cache_key)
+    except OSError:
+        return False
+
+
+def _store_merge_cache(output_path: Path, cache_key: str) -> None:
+    cache_path = _merge_cache_path(output_path)
+    try:
+        cache_path.write_text(_merge_cache_entry(output_path, cache_key), encoding="utf-8")
+    except OSError as e:
+        logger.warning("Could not write merge cache %s: %s", cache_path, e)
+
+
+class _ReadAhead:
+    """Reads input files in a thread pool, running up to ``_READ_AHEAD`` files ahead.
+
+    Reads are started and handed out in the order of ``source_paths``, which may still be
+    growing while the first reads run.
+    """
+
+    def __init__(self, executor: ThreadPoolExecutor) -> None:
+        self.source_paths: list[Path] = []
+        # stat() results for source_paths, when they were taken up front
+        self.source_stats: list[os.stat_result | None] | None = None
+        self._executor = executor
+        self._pending: deque[Future[str]] = deque()
+        self._next_index = 0
+
+    def fill(self) -> None:
+        """Start reads for the next paths until the read-ahead window is full."""
+        while self._next_index < len(self.source_paths) and len(self._pending) < _READ_AHEAD:
+            path = self.source_paths[self._next_index]
+            known_stat = self.source_stats[self._next_index] if self.source_stats else None
+            self._pending.append(self._executor.submit(_read_utf8, path, known_stat))
+            self._next_index += 1
+
+    def next_read(self) -> Future[str]:
+        """Return the read of the next file in order, keeping the window full."""
+        self.fill()
+        return self._pending.popleft()
+
+
+def _render_header(**fields: object) -> bytes:
+    """Fill in HEADER_TEMPLATE, encoding only the field values."""
+    return b"".join(
+        part if isinstance(part, bytes) else str(fields[part]).encode("utf-8")
+        for part in _HEADER_PARTS
     )
 
-    final_content = header
-    final_content += "".join(merged_content_parts)
 
-    write_merged_output(output_path, final_content)
+def _iter_merged_chunks(header: bytes, reads: _ReadAhead) -> Iterator[str | bytes]:
+    """Yield the header, then each file's separator and content in input order."""
+    source_paths = reads.source_paths
+    total_files = len(source_paths)
+    yield header
+
+    for file_index, source_path in enumerate(source_paths):
+        pending_read = reads.next_read()
 
+        # Path.name is recomputed on every access, so look it up once per file
+        file_name = source_path.name
+        logger.info("Processing file (%d/%d): %s", file_index + 1, total_files, file_name)
+        file_content = _read_result(pending_read, source_path)
+        if file_content is None:
+            continue
 
-def write_merged_output(output_path: Path, content: str) -> None:
-    logger.debug(f"Writing merged content to {output_path}")
+        logger.debug("Read %d characters from %s", len(file_content), source_path)
+
+        # Add separator before files except the first one
+        if file_index > 0:
+            yield _SEPARATOR_PREFIX + file_name.encode("utf-8") + _SEPARATOR_SUFFIX
+
+        yield file_content
+
+
+def _read_result(pending_read: Future[str], source_path: Path) -> str | None:
+    """Wait for a file's read, returning None if the file has to be skipped."""
     try:
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text(content, encoding="utf-8")
-        logger.info(f"Successfully merged content into {output_path}")
+        return pending_read.result()
+    except OSError as e:
+        if isinstance(e, FileNotFoundError):
+            logger.warning("Skipping file %s: Not found.", source_path)
+        else:
+            logger.error("Skipping file %s due to read error: %s", source_path, e, exc_info=False)
+        return None
+    except Exception as e:
+        logger.error("Skipping file %s due to unexpected error: %s", source_path, e, exc_info=True)
+        raise FileProcessingError(f"Unexpected error reading file {source_path}: {e}") from e
+
+
+def write_merged_output(output_path: Path, content: str | Iterable[str | bytes]) -> None:
+    """Write the merged document, given either whole or as chunks written as they arrive."""
+    logger.debug("Writing merged content to %s", output_path)
+    chunks = (content,) if isinstance(content, str) else content
+    try:
+        _replace_output(output_path, chunks)
+        logger.info("Successfully merged content into %s", output_path)
+    except FileProcessingError:
+        # Raised while producing the chunks, e.g. for an input that could not be read
+        raise
     except OSError as e:
-        logger.critical(f"Failed to write merged output to {output_path}: {e}", exc_info=True)
+        logger.critical("Failed to write merged output to %s: %s", output_path, e, exc_info=True)
         raise FileProcessingError(f"Error writing output file {output_path}: {e}") from e
     except Exception as e:
         logger.critical(
-            f"Failed to write merged output to {output_path} due to unexpected error: {e}",
+            "Failed to write merged output to %s due to unexpected error: %s",
+            output_path,
+            e,
             exc_info=True,
         )
         raise FileProcessingError(f"Unexpected error writing output file {output_path}: {e}") from e
     logger.info("Merge process completed.")
+
+
+def _replace_output(output_path: Path, chunks: Iterable[str | bytes]) -> None:
+    """Write the chunks to a temporary file beside the output, then move it into place.
+
+    The previous output is left untouched until the new document is complete, so a failed
+    merge keeps it intact and an input that is the output itself is read in full. A
+    symlinked output is followed, and an existing output's permission bits are kept.
+    """
+    target_path = output_path.resolve()
+    temp_path = target_path.with_name(f".{target_path.name}.{os.urandom(4).hex()}.tmp")
+    try:
+        with _open_output(temp_path) as output_file:
+            _copy_output_mode(target_path, temp_path)
+            _write_chunks(output_file, chunks)
+        temp_path.replace(target_path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+
+def _copy_output_mode(target_path: Path, temp_path: Path) -> None:
+    """Give the new output the permission bits of the file it replaces, if there is one."""
+    try:
+        target_mode = target_path.stat().st_mode
+    except FileNotFoundError:
+        return
+    temp_path.chmod(stat.S_IMODE(target_mode))
+
+
+def _open_output(output_path: Path) -> BinaryIO:
+    """Create a new output file, creating its parent directories only if they are missing."""
+    try:
+        return output_path.open("xb", buffering=_WRITE_BUFFER_SIZE)
+    except FileNotFoundError:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        return output_path.open("xb", buffering=_WRITE_BUFFER_SIZE)
+
+
+def _write_chunks(output_file: BinaryIO, chunks: Iterable[str | bytes]) -> None:
+    for chunk in chunks:
+        output_file.write(chunk if isinstance(chunk, bytes) else chunk.encode("utf-8"))